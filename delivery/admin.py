@@ -2,15 +2,27 @@
 Admin configuration for delivery app.
 """
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from .models import DeliveryRequest, Route, SyncLog, Statistics
 
 
+class DeliveryRequestChangeList(ChangeList):
+    """
+    Changelist that only loads the columns shown in list_display.
+    """
+    def get_queryset(self, request, exclude_parameters=None):
+        return super().get_queryset(request, exclude_parameters).only(
+            'id', 'customer_name', 'pickup_address', 'dropoff_address', 'status', 'created_at', 'driver__email'
+        )
+
+
 @admin.register(DeliveryRequest)
 class DeliveryRequestAdmin(admin.ModelAdmin):
     """
     Admin for DeliveryRequest model.
     """
     list_display = ['id', 'customer_name', 'pickup_address', 'dropoff_address', 'status', 'driver', 'created_at']
+    list_select_related = ['driver']
     list_filter = ['status', 'sync_status', 'created_at', 'driver']
     search_fields = ['customer_name', 'pickup_address', 'dropoff_address', 'customer_phone']
     ordering = ['-created_at']
@@ -32,6 +44,9 @@ class DeliveryRequestAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+    
+    def get_changelist(self, request, **kwargs):
+        return DeliveryRequestChangeList
 
 
 @admin.register(Route)
@@ -40,6 +55,7 @@ class RouteAdmin(admin.ModelAdmin):
     Admin for Route model.
     """
     list_display = ['delivery_request', 'distance', 'duration', 'mode', 'created_at']
+    list_select_related = ['delivery_request']
     list_filter = ['mode', 'created_at']
     search_fields = ['delivery_request__customer_name']
     ordering = ['-created_at']
@@ -51,10 +67,13 @@ class SyncLogAdmin(admin.ModelAdmin):
     Admin for SyncLog model.
     """
     list_display = ['delivery_request', 'status', 'created_at']
+    list_select_related = ['delivery_request']
     list_filter = ['status', 'created_at']
     search_fields = ['delivery_request__customer_name', 'message']
     ordering = ['-created_at']
     readonly_fields = ['created_at']
+    raw_id_fields = ['delivery_request']
+    show_full_result_count = False
 
 
 @admin.register(Statistics)
@@ -63,6 +82,7 @@ class StatisticsAdmin(admin.ModelAdmin):
     Admin for Statistics model.
     """
     list_display = ['user', 'date', 'total_deliveries', 'completed_deliveries', 'total_earnings']
+    list_select_related = ['user']
     list_filter = ['date', 'user']
     search_fields = ['user__email', 'user__first_name', 'user__last_name']
     ordering = ['-date']
@@ -6,4 +6,7 @@ from django.apps import AppConfig
  
 class DeliveryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'delivery' 
\ No newline at end of file
+    name = 'delivery'
+    
+    def ready(self):
+        from . import signals  # noqa: F401 
\ No newline at end of file
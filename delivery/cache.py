@@ -0,0 +1,51 @@
+"""
+Cache helpers for the delivery app.
+"""
+from django.core.cache import cache
+
+# Partner availability changes slowly, so a short TTL is enough
+PARTNERS_CACHE_TIMEOUT = 30
+
+
+def partners_cache_key(available_only):
+    """
+    Return the cache key for the partner list.
+    """
+    return f"partners:v1:{'available' if available_only else 'all'}"
+
+
+def invalidate_partners():
+    """
+    Drop every cached variant of the partner list.
+    """
+    cache.delete_many([partners_cache_key(True), partners_cache_key(False)])
+
+
+# Statistics are dropped whenever a delivery request changes, so the TTL only
+# bounds how long a cached "today" survives past midnight
+STATISTICS_CACHE_TIMEOUT = 60
+
+# Periods the statistics views distinguish; anything else is reported as all time
+STATISTICS_PERIODS = ('all', 'today', 'week', 'month')
+
+
+def statistics_cache_key(kind, user_id, period):
+    """
+    Return the cache key for a driver's or customer's statistics over a period.
+    """
+    if period not in STATISTICS_PERIODS:
+        period = 'all'
+    return f'statistics:v1:{kind}:{user_id}:{period}'
+
+
+def invalidate_statistics(*user_ids):
+    """
+    Drop every cached statistics variant for the given users.
+    """
+    cache.delete_many([
+        statistics_cache_key(kind, user_id, period)
+        for user_id in user_ids
+        if user_id is not None
+        for kind in ('driver', 'customer')
+        for period in STATISTICS_PERIODS
+    ])
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.4 on 2026-10-15 20:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0004_remove_deliveryrequest_partner_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="deliveryrequest",
+            index=models.Index(
+                fields=["-created_at"], name="delivery_de_created_05ba37_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deliveryrequest",
+            index=models.Index(
+                fields=["status", "-created_at"], name="delivery_de_status_818563_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deliveryrequest",
+            index=models.Index(
+                fields=["sync_status", "pending_sync"],
+                name="delivery_de_sync_st_3d4229_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deliveryrequest",
+            index=models.Index(
+                fields=["driver", "status"], name="delivery_de_driver__de25ac_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deliveryrequest",
+            index=models.Index(
+                fields=["customer", "-created_at"],
+                name="delivery_de_custome_9ed28d_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="statistics",
+            index=models.Index(
+                fields=["user", "-date"], name="delivery_st_user_id_81cc2b_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2026-10-15 20:45
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_user_caches(apps, schema_editor):
+    DeliveryRequest = apps.get_model("delivery", "DeliveryRequest")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    customers = User.objects.filter(pk=OuterRef("customer_id"))
+    drivers = User.objects.filter(pk=OuterRef("driver_id"))
+    DeliveryRequest.objects.update(
+        customer_email_cache=Subquery(customers.values("email")[:1]),
+        driver_email_cache=Subquery(drivers.values("email")[:1]),
+        driver_name_cache=Subquery(drivers.values("first_name")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0005_deliveryrequest_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="deliveryrequest",
+            name="customer_email_cache",
+            field=models.EmailField(blank=True, editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name="deliveryrequest",
+            name="driver_email_cache",
+            field=models.EmailField(
+                blank=True, editable=False, max_length=254, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="deliveryrequest",
+            name="driver_name_cache",
+            field=models.CharField(
+                blank=True, editable=False, max_length=150, null=True
+            ),
+        ),
+        migrations.RunPython(backfill_user_caches, migrations.RunPython.noop),
+    ]
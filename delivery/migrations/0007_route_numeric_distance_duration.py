@@ -0,0 +1,62 @@
+# Generated by Django 5.2.4 on 2026-10-15 20:47
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copies of the parser in delivery.models, so this migration keeps
+# behaving the same when the model code changes
+_QUANTITY_RE = re.compile(r"([\d.,]+)\s*([a-z]+)")
+
+DISTANCE_UNITS = {"km": 1000, "m": 1, "mi": 1609.344, "ft": 0.3048}
+DURATION_UNITS = {
+    "hour": 3600, "hours": 3600, "hr": 3600, "hrs": 3600, "h": 3600,
+    "min": 60, "mins": 60, "minute": 60, "minutes": 60,
+    "sec": 1, "secs": 1, "second": 1, "seconds": 1, "s": 1,
+}
+
+
+def parse_quantity(value, units):
+    total = 0
+    found = False
+    for number, unit in _QUANTITY_RE.findall((value or "").lower()):
+        if unit not in units:
+            continue
+        try:
+            total += float(number.replace(",", "")) * units[unit]
+        except ValueError:
+            continue
+        found = True
+    return round(total) if found else None
+
+
+def parse_route_strings(apps, schema_editor):
+    Route = apps.get_model("delivery", "Route")
+    routes = list(Route.objects.only("id", "distance", "duration"))
+    for route in routes:
+        route.distance_meters = parse_quantity(route.distance, DISTANCE_UNITS)
+        route.duration_seconds = parse_quantity(route.duration, DURATION_UNITS)
+    Route.objects.bulk_update(
+        routes, ["distance_meters", "duration_seconds"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0006_deliveryrequest_user_caches"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="route",
+            name="distance_meters",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="route",
+            name="duration_seconds",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(parse_route_strings, migrations.RunPython.noop),
+    ]
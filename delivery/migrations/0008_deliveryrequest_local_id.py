@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-15 20:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0007_route_numeric_distance_duration"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="deliveryrequest",
+            name="local_id",
+            field=models.CharField(
+                blank=True,
+                help_text="ID assigned by the client for offline sync",
+                max_length=100,
+                null=True,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="deliveryrequest",
+            constraint=models.UniqueConstraint(
+                fields=("customer", "local_id"), name="dr_customer_local_id_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-15 20:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0008_deliveryrequest_local_id"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="synclog",
+            index=models.Index(
+                fields=["-created_at"], name="delivery_sy_created_e798d7_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="synclog",
+            index=models.Index(
+                fields=["delivery_request", "-created_at"],
+                name="delivery_sy_deliver_0e00a1_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-15 20:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0009_synclog_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="deliveryrequest",
+            index=models.Index(
+                fields=["driver", "-created_at"], name="delivery_de_driver__d912c1_idx"
+            ),
+        ),
+    ]
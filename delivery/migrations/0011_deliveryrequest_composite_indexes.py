@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-15 20:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0010_deliveryrequest_driver_created_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="deliveryrequest",
+            index=models.Index(
+                fields=["customer", "status"], name="delivery_de_custome_12df5d_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deliveryrequest",
+            index=models.Index(
+                fields=["driver", "sync_status"], name="delivery_de_driver__f32e8f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deliveryrequest",
+            index=models.Index(
+                fields=["customer", "sync_status"],
+                name="delivery_de_custome_3b684e_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-15 21:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("delivery", "0011_deliveryrequest_composite_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="deliveryrequest",
+            name="delivery_de_driver__de25ac_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="deliveryrequest",
+            name="delivery_de_custome_12df5d_idx",
+        ),
+        migrations.AddIndex(
+            model_name="deliveryrequest",
+            index=models.Index(
+                fields=["driver", "status", "created_at"],
+                name="delivery_de_driver__b54921_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deliveryrequest",
+            index=models.Index(
+                fields=["customer", "status", "created_at"],
+                name="delivery_de_custome_41751d_idx",
+            ),
+        ),
+    ]
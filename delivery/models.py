@@ -1,12 +1,42 @@
 """
 Models for delivery requests and related functionality.
 """
+import re
+
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 User = get_user_model()
 
+_QUANTITY_RE = re.compile(r'([\d.,]+)\s*([a-z]+)')
+
+DISTANCE_UNITS = {'km': 1000, 'm': 1, 'mi': 1609.344, 'ft': 0.3048}
+DURATION_UNITS = {
+    'hour': 3600, 'hours': 3600, 'hr': 3600, 'hrs': 3600, 'h': 3600,
+    'min': 60, 'mins': 60, 'minute': 60, 'minutes': 60,
+    'sec': 1, 'secs': 1, 'second': 1, 'seconds': 1, 's': 1,
+}
+
+
+def parse_quantity(value, units):
+    """
+    Parse a display string such as "2.5 km" or "1 hour 5 mins" into base units.
+    
+    Returns None if the string contains no recognised quantity.
+    """
+    total = 0
+    found = False
+    for number, unit in _QUANTITY_RE.findall((value or '').lower()):
+        if unit not in units:
+            continue
+        try:
+            total += float(number.replace(',', '')) * units[unit]
+        except ValueError:
+            continue
+        found = True
+    return round(total) if found else None
+
 
 class DeliveryRequest(models.Model):
     """
@@ -37,6 +67,7 @@ class DeliveryRequest(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     sync_status = models.CharField(max_length=20, choices=SYNC_STATUS_CHOICES, default='synced')
     pending_sync = models.BooleanField(default=False, help_text='Indicates if this request was created offline')
+    local_id = models.CharField(max_length=100, null=True, blank=True, help_text='ID assigned by the client for offline sync')
     
     # Coordinates
     pickup_latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
@@ -49,6 +80,12 @@ class DeliveryRequest(models.Model):
     driver = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='driver_deliveries', help_text='Driver assigned to this request')
     assigned_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='assigned_deliveries', help_text='Admin who assigned the driver')
     
+    # Copies of the customer's and driver's display fields, so listings
+    # don't need to join the users table
+    customer_email_cache = models.EmailField(blank=True, editable=False)
+    driver_email_cache = models.EmailField(null=True, blank=True, editable=False)
+    driver_name_cache = models.CharField(max_length=150, null=True, blank=True, editable=False)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -57,10 +94,73 @@ class DeliveryRequest(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['status', '-created_at']),
+            models.Index(fields=['sync_status', 'pending_sync']),
+            # Also serve plain (driver, status) / (customer, status) lookups via their prefix
+            models.Index(fields=['driver', 'status', 'created_at']),
+            models.Index(fields=['customer', 'status', 'created_at']),
+            models.Index(fields=['driver', 'sync_status']),
+            models.Index(fields=['customer', 'sync_status']),
+            models.Index(fields=['customer', '-created_at']),
+            # Also backs the driver's assigned-requests list, filtering status per row
+            models.Index(fields=['driver', '-created_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['customer', 'local_id'], name='dr_customer_local_id_uniq'),
+        ]
     
     def __str__(self):
         return f"Delivery {self.id} - {self.customer_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The users as stored, so a save can tell which relation changed and a
+        # reassignment can tell which driver lost the request
+        instance.loaded_customer_id = instance.__dict__.get('customer_id')
+        instance.loaded_driver_id = instance.__dict__.get('driver_id')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        self.refresh_user_caches()
+        
+        # Keep the cached columns in step with their relation on partial saves
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'customer' in update_fields:
+                update_fields.add('customer_email_cache')
+            if 'driver' in update_fields:
+                update_fields.update(['driver_email_cache', 'driver_name_cache'])
+            kwargs['update_fields'] = update_fields
+        
+        super().save(*args, **kwargs)
+        self.loaded_customer_id = self.customer_id
+        self.loaded_driver_id = self.driver_id
+    
+    def refresh_user_caches(self):
+        """
+        Copy the customer's and driver's display fields onto this request.
+        
+        Relations already loaded on the instance are read as they are; one set
+        by id alone is loaded, one query each, only when it differs from the
+        stored value. Also call this before bulk_create(), which skips save().
+        """
+        if DeliveryRequest.customer.is_cached(self) or (
+            self.customer_id is not None
+            and self.customer_id != getattr(self, 'loaded_customer_id', None)
+        ):
+            self.customer_email_cache = self.customer.email
+        
+        if self.driver_id is None:
+            self.driver_email_cache = None
+            self.driver_name_cache = None
+        elif DeliveryRequest.driver.is_cached(self) or self.driver_id != getattr(self, 'loaded_driver_id', None):
+            self.driver_email_cache = self.driver.email
+            self.driver_name_cache = self.driver.first_name
+    
     @property
     def coordinates(self):
         """Return coordinates in the format expected by the API."""
@@ -80,7 +180,7 @@ class DeliveryRequest(models.Model):
         self.sync_status = 'synced'
         self.pending_sync = False
         self.synced_at = timezone.now()
-        self.save()
+        self.save(update_fields=['sync_status', 'pending_sync', 'synced_at', 'updated_at'])
     
     def assign_driver(self, driver, assigned_by=None):
         """Assign a driver to this delivery request."""
@@ -88,7 +188,7 @@ class DeliveryRequest(models.Model):
         self.status = 'assigned'
         self.assigned_by = assigned_by
         self.assigned_at = timezone.now()
-        self.save()
+        self.save(update_fields=['driver', 'status', 'assigned_by', 'assigned_at', 'updated_at'])
 
 
 class Route(models.Model):
@@ -98,6 +198,8 @@ class Route(models.Model):
     delivery_request = models.OneToOneField(DeliveryRequest, on_delete=models.CASCADE, related_name='route')
     distance = models.CharField(max_length=50)  # e.g., "2.5 km"
     duration = models.CharField(max_length=50)  # e.g., "8 mins"
+    distance_meters = models.PositiveIntegerField(null=True, blank=True)
+    duration_seconds = models.PositiveIntegerField(null=True, blank=True)
     polyline = models.TextField()  # Encoded polyline string
     mode = models.CharField(max_length=20, default='driving')  # driving, walking, bicycling
     
@@ -105,6 +207,23 @@ class Route(models.Model):
     
     def __str__(self):
         return f"Route for Delivery {self.delivery_request.id}"
+    
+    def save(self, *args, **kwargs):
+        # The numeric columns are always derived from the display strings, so
+        # editing a string can't leave them stale
+        self.distance_meters = parse_quantity(self.distance, DISTANCE_UNITS)
+        self.duration_seconds = parse_quantity(self.duration, DURATION_UNITS)
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'distance' in update_fields:
+                update_fields.add('distance_meters')
+            if 'duration' in update_fields:
+                update_fields.add('duration_seconds')
+            kwargs['update_fields'] = update_fields
+        
+        super().save(*args, **kwargs)
 
 
 class SyncLog(models.Model):
@@ -118,6 +237,10 @@ class SyncLog(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['delivery_request', '-created_at']),
+        ]
     
     def __str__(self):
         return f"Sync log for Delivery {self.delivery_request.id} - {self.status}"
@@ -141,6 +264,9 @@ class Statistics(models.Model):
     class Meta:
         unique_together = ['user', 'date']
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['user', '-date']),
+        ]
     
     def __str__(self):
         return f"Statistics for {self.user.email} on {self.date}" 
\ No newline at end of file
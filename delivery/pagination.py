@@ -0,0 +1,15 @@
+"""
+Pagination classes for the delivery app.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class DeliveryRequestCursorPagination(CursorPagination):
+    """
+    Keyset pagination over delivery requests, newest first.
+    
+    Pages are fetched with a WHERE on the last row seen rather than an
+    OFFSET, and no COUNT(*) is run over the filtered requests.
+    """
+    ordering = '-created_at'
+    page_size = 10
\ No newline at end of file
@@ -4,72 +4,84 @@ Custom permission classes for role-based access control.
 from rest_framework import permissions
 
 
-class IsCustomer(permissions.BasePermission):
+def _role(request):
+    """
+    Return the user's role, memoized on the request so that stacked
+    permission checks only read it once.
+    """
+    try:
+        return request._cached_role
+    except AttributeError:
+        request._cached_role = request.user.role
+        return request._cached_role
+
+
+class IsCustomer(permissions.IsAuthenticated):
     """
     Permission to check if user is a customer.
     """
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role == 'customer'
+        return super().has_permission(request, view) and _role(request) == 'customer'
 
 
-class IsDriver(permissions.BasePermission):
+class IsDriver(permissions.IsAuthenticated):
     """
     Permission to check if user is a driver.
     """
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role == 'driver'
+        return super().has_permission(request, view) and _role(request) == 'driver'
 
 
-class IsAdmin(permissions.BasePermission):
+class IsAdmin(permissions.IsAuthenticated):
     """
     Permission to check if user is an admin.
     """
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role == 'admin'
+        return super().has_permission(request, view) and _role(request) == 'admin'
 
 
-class IsCustomerOrAdmin(permissions.BasePermission):
+class IsCustomerOrAdmin(permissions.IsAuthenticated):
     """
     Permission to check if user is a customer or admin.
     """
+    _ALLOWED = frozenset({'customer', 'admin'})
+    
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in ['customer', 'admin']
+        return super().has_permission(request, view) and _role(request) in self._ALLOWED
 
 
-class IsDriverOrAdmin(permissions.BasePermission):
+class IsDriverOrAdmin(permissions.IsAuthenticated):
     """
     Permission to check if user is a driver or admin.
     """
+    _ALLOWED = frozenset({'driver', 'admin'})
+    
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.role in ['driver', 'admin']
+        return super().has_permission(request, view) and _role(request) in self._ALLOWED
 
 
-class IsOwnerOrAdmin(permissions.BasePermission):
+class IsOwnerOrAdmin(permissions.IsAuthenticated):
     """
     Permission to check if user owns the object or is admin.
     """
+    # Admin can access everything, customers only their own requests
+    # and drivers only their assigned requests. The FK id columns are
+    # compared so the related users are never fetched.
+    _OWNERSHIP_CHECKS = {
+        'admin': lambda user, obj: True,
+        'customer': lambda user, obj: obj.customer_id == user.id,
+        'driver': lambda user, obj: obj.driver_id == user.id,
+    }
+    
     def has_object_permission(self, request, view, obj):
-        # Admin can access everything
-        if request.user.role == 'admin':
-            return True
-        
-        # Customer can only access their own requests
-        if request.user.role == 'customer':
-            return obj.customer == request.user
-        
-        # Driver can only access their assigned requests
-        if request.user.role == 'driver':
-            return obj.driver == request.user
-        
-        return False
-
-
-class MobileAppPermission(permissions.BasePermission):
+        check = self._OWNERSHIP_CHECKS.get(_role(request))
+        return check is not None and check(request.user, obj)
+
+
+class MobileAppPermission(permissions.IsAuthenticated):
     """
     Permission to block admin access to mobile app endpoints.
     """
     def has_permission(self, request, view):
         # Block admin access to mobile endpoints
-        if request.user.role == 'admin':
-            return False
-        return request.user.is_authenticated 
\ No newline at end of file
+        return super().has_permission(request, view) and _role(request) != 'admin' 
\ No newline at end of file
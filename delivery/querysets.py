@@ -0,0 +1,27 @@
+"""
+Shared querysets for the delivery app.
+"""
+from .models import DeliveryRequest
+from .serializers import DeliveryRequestSerializer
+
+
+def deliveries_for(user):
+    """
+    Return the delivery requests the user may see, eager-loaded for DeliveryRequestSerializer.
+    """
+    role = user.role
+    queryset = DeliveryRequestSerializer.setup_eager_loading(DeliveryRequest.objects.all())
+    
+    # Admin sees all requests
+    if role == 'admin':
+        return queryset
+    
+    # Customer sees only their own requests
+    elif role == 'customer':
+        return queryset.filter(customer=user)
+    
+    # Driver sees only their assigned requests
+    elif role == 'driver':
+        return queryset.filter(driver=user)
+    
+    return queryset.none()
\ No newline at end of file
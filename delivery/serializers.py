@@ -1,9 +1,12 @@
 """
 Serializers for delivery requests and related functionality.
 """
+import math
+import re
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from drf_spectacular.utils import extend_schema_field
 from .models import DeliveryRequest, Route, Statistics
 
 User = get_user_model()
@@ -13,16 +16,16 @@ class PickupCoordinatesSerializer(serializers.Serializer):
     """
     Serializer for pickup coordinates.
     """
-    latitude = serializers.FloatField(help_text="Pickup latitude")
-    longitude = serializers.FloatField(help_text="Pickup longitude")
+    latitude = serializers.FloatField(min_value=-90, max_value=90, help_text="Pickup latitude")
+    longitude = serializers.FloatField(min_value=-180, max_value=180, help_text="Pickup longitude")
 
 
 class DropoffCoordinatesSerializer(serializers.Serializer):
     """
     Serializer for dropoff coordinates.
     """
-    latitude = serializers.FloatField(help_text="Dropoff latitude")
-    longitude = serializers.FloatField(help_text="Dropoff longitude")
+    latitude = serializers.FloatField(min_value=-90, max_value=90, help_text="Dropoff latitude")
+    longitude = serializers.FloatField(min_value=-180, max_value=180, help_text="Dropoff longitude")
 
 
 class CoordinatesSerializer(serializers.Serializer):
@@ -33,14 +36,46 @@ class CoordinatesSerializer(serializers.Serializer):
     dropoff = DropoffCoordinatesSerializer(help_text="Dropoff coordinates")
 
 
+@extend_schema_field(CoordinatesSerializer)
+class CoordinatesField(serializers.Field):
+    """
+    Read-only field rendering the coordinate columns as a nested dict.
+    """
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+    
+    def to_representation(self, instance):
+        pickup_latitude = instance.pickup_latitude
+        pickup_longitude = instance.pickup_longitude
+        dropoff_latitude = instance.dropoff_latitude
+        dropoff_longitude = instance.dropoff_longitude
+        return {
+            'pickup': {
+                'latitude': None if pickup_latitude is None else float(pickup_latitude),
+                'longitude': None if pickup_longitude is None else float(pickup_longitude),
+            },
+            'dropoff': {
+                'latitude': None if dropoff_latitude is None else float(dropoff_latitude),
+                'longitude': None if dropoff_longitude is None else float(dropoff_longitude),
+            }
+        }
+
+
 class DeliveryRequestSerializer(serializers.ModelSerializer):
     """
     Serializer for delivery requests.
+    
+    Customer and driver details are read from the columns cached on the
+    request; assigned_by_email still traverses the relation, so querysets
+    serialized with many=True should be passed through setup_eager_loading()
+    first.
     """
-    coordinates = serializers.SerializerMethodField()
-    customer_email = serializers.CharField(source='customer.email', read_only=True)
-    driver_email = serializers.CharField(source='driver.email', read_only=True)
-    driver_name = serializers.CharField(source='driver.first_name', read_only=True)
+    coordinates = CoordinatesField()
+    customer_email = serializers.CharField(source='customer_email_cache', read_only=True)
+    driver_email = serializers.CharField(source='driver_email_cache', read_only=True)
+    driver_name = serializers.CharField(source='driver_name_cache', read_only=True)
     assigned_by_email = serializers.CharField(source='assigned_by.email', read_only=True)
     
     class Meta:
@@ -53,37 +88,35 @@ class DeliveryRequestSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'synced_at', 'assigned_at']
     
-    def get_coordinates(self, obj):
-        return obj.coordinates
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the relations read by this serializer into a single query."""
+        return queryset.select_related('assigned_by')
 
 
 class DeliveryRequestCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating delivery requests.
+    
+    Coordinates are stored as four flat fields. The nested ``coordinates``
+    payload sent by clients is validated and flattened onto them first.
     """
-    coordinates = CoordinatesSerializer(required=False)
-    local_id = serializers.CharField(required=False, help_text='Local ID for offline sync')
+    pickup_latitude = serializers.FloatField(required=False, min_value=-90, max_value=90, help_text="Pickup latitude")
+    pickup_longitude = serializers.FloatField(required=False, min_value=-180, max_value=180, help_text="Pickup longitude")
+    dropoff_latitude = serializers.FloatField(required=False, min_value=-90, max_value=90, help_text="Dropoff latitude")
+    dropoff_longitude = serializers.FloatField(required=False, min_value=-180, max_value=180, help_text="Dropoff longitude")
+    local_id = serializers.CharField(max_length=100, required=False, help_text='Local ID for offline sync')
     
     class Meta:
         model = DeliveryRequest
         fields = [
             'pickup_address', 'dropoff_address', 'customer_name', 'customer_phone',
-            'delivery_note', 'coordinates', 'pending_sync', 'local_id'
+            'delivery_note', 'pickup_latitude', 'pickup_longitude',
+            'dropoff_latitude', 'dropoff_longitude', 'pending_sync', 'local_id'
         ]
     
     def create(self, validated_data):
-        coordinates = validated_data.pop('coordinates', {})
-        local_id = validated_data.pop('local_id', None)
-        
-        # Extract coordinates if provided
-        if coordinates:
-            pickup_coords = coordinates.get('pickup', {})
-            dropoff_coords = coordinates.get('dropoff', {})
-            
-            validated_data['pickup_latitude'] = pickup_coords.get('latitude')
-            validated_data['pickup_longitude'] = pickup_coords.get('longitude')
-            validated_data['dropoff_latitude'] = dropoff_coords.get('latitude')
-            validated_data['dropoff_longitude'] = dropoff_coords.get('longitude')
+        validated_data.pop('local_id', None)
         
         # Set sync status based on pending_sync
         if validated_data.get('pending_sync', False):
@@ -93,44 +126,57 @@ class DeliveryRequestCreateSerializer(serializers.ModelSerializer):
     
     def to_internal_value(self, data):
         """
-        Override to handle coordinates properly for sync operations.
-        """
-        # Extract coordinates before validation
-        coordinates = data.get('coordinates', {})
+        Validate a nested coordinates payload and flatten it onto the coordinate fields.
         
-        # Convert coordinates to proper format if needed
-        if coordinates and isinstance(coordinates, dict):
-            # Ensure coordinates have proper structure
-            if 'pickup' not in coordinates:
-                coordinates['pickup'] = {}
-            if 'dropoff' not in coordinates:
-                coordinates['dropoff'] = {}
+        A payload that has ``coordinates`` must give both points with both axes,
+        as CoordinatesSerializer requires.
+        """
+        if isinstance(data, dict) and 'coordinates' in data:
+            try:
+                coordinates = CoordinatesSerializer().run_validation(data['coordinates'])
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError({'coordinates': exc.detail})
+            
+            data = {key: value for key, value in data.items() if key != 'coordinates'}
+            for point in ('pickup', 'dropoff'):
+                data[f'{point}_latitude'] = coordinates[point]['latitude']
+                data[f'{point}_longitude'] = coordinates[point]['longitude']
         
         return super().to_internal_value(data)
+    
+    def to_representation(self, instance):
+        """
+        Represent the created request the same way as DeliveryRequestSerializer.
+        """
+        return DeliveryRequestSerializer(instance, context=self.context).data
 
 
 class DeliveryRequestUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for updating delivery requests.
     """
-    driver = serializers.PrimaryKeyRelatedField(queryset=User.objects.filter(role='driver'), required=False, help_text='Driver ID to assign')
+    driver = serializers.PrimaryKeyRelatedField(queryset=User.objects.filter(role='driver').only('id', 'email', 'first_name'), required=False, help_text='Driver ID to assign')
     
     class Meta:
         model = DeliveryRequest
         fields = ['status', 'driver']
     
     def update(self, instance:DeliveryRequest, validated_data):
+        update_fields = ['updated_at']
+        
         # Update status
         if 'status' in validated_data:
             instance.status = validated_data['status']
+            update_fields.append('status')
         
         # Update driver
         if 'driver' in validated_data:
             instance.driver = validated_data['driver']
             instance.status = 'assigned'
             instance.assigned_at = timezone.now()
+            update_fields.extend(['driver', 'status', 'assigned_at'])
         
-        instance.save()
+        instance.save(update_fields=update_fields)
         return instance
 
 
@@ -170,6 +216,84 @@ class SyncRequestSerializer(serializers.Serializer):
     requests = DeliveryRequestCreateSerializer(many=True)
 
 
+# Characters DRF's CharField rejects; payloads containing them take the full validation path
+_UNSAFE_CHARS_RE = re.compile('[\x00\ud800-\udfff]')
+_SYNC_REQUIRED_FIELDS = ('pickup_address', 'dropoff_address', 'customer_name', 'customer_phone')
+_SYNC_OPTIONAL_FIELDS = ('delivery_note', 'local_id')
+_COORDINATE_FIELDS = ('pickup_latitude', 'pickup_longitude', 'dropoff_latitude', 'dropoff_longitude')
+_MAX_LENGTHS = {
+    name: DeliveryRequest._meta.get_field(name).max_length
+    for name in _SYNC_REQUIRED_FIELDS + _SYNC_OPTIONAL_FIELDS
+}
+
+
+def _fast_string(value, name, allow_blank=False):
+    if type(value) is not str or value != value.strip() or _UNSAFE_CHARS_RE.search(value):
+        raise ValueError(name)
+    if not value and not allow_blank:
+        raise ValueError(name)
+    max_length = _MAX_LENGTHS[name]
+    if max_length is not None and len(value) > max_length:
+        raise ValueError(name)
+    return value
+
+
+def _fast_coordinate(value, name):
+    # Out of range values would also overflow the model's DecimalField(9, 6)
+    limit = 90 if name.endswith('_latitude') else 180
+    if type(value) not in (int, float) or not math.isfinite(value) or abs(value) > limit:
+        raise ValueError(name)
+    return float(value)
+
+
+def _fast_parse_item(item):
+    if type(item) is not dict or any(name in item for name in _COORDINATE_FIELDS):
+        raise ValueError('item')
+    
+    parsed = {name: _fast_string(item[name], name) for name in _SYNC_REQUIRED_FIELDS}
+    if 'delivery_note' in item:
+        parsed['delivery_note'] = _fast_string(item['delivery_note'], 'delivery_note', allow_blank=True)
+    if 'local_id' in item:
+        parsed['local_id'] = _fast_string(item['local_id'], 'local_id')
+    if 'pending_sync' in item:
+        if type(item['pending_sync']) is not bool:
+            raise ValueError('pending_sync')
+        parsed['pending_sync'] = item['pending_sync']
+    
+    if 'coordinates' in item:
+        # Both points with both axes, or the serializer reports what is missing
+        coordinates = item['coordinates']
+        if type(coordinates) is not dict:
+            raise ValueError('coordinates')
+        for point in ('pickup', 'dropoff'):
+            values = coordinates[point]
+            if type(values) is not dict:
+                raise ValueError(point)
+            for axis in ('latitude', 'longitude'):
+                name = f'{point}_{axis}'
+                parsed[name] = _fast_coordinate(values[axis], name)
+    
+    return parsed
+
+
+def fast_parse_sync_requests(data):
+    """
+    Validate the common sync payload shape without building serializers.
+    
+    Returns the same list as ``SyncRequestSerializer(...).validated_data['requests']``
+    for payloads made of plain JSON types that need no coercion, or ``None``
+    when the payload must go through SyncRequestSerializer instead.
+    """
+    items = data.get('requests') if isinstance(data, dict) else None
+    if type(items) is not list:
+        return None
+    
+    try:
+        return [_fast_parse_item(item) for item in items]
+    except (KeyError, ValueError):
+        return None
+
+
 class SyncResponseSerializer(serializers.Serializer):
     """
     Serializer for sync responses.
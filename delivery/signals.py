@@ -0,0 +1,78 @@
+"""
+Signal handlers for the delivery app.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from .cache import invalidate_partners, invalidate_statistics
+from .models import DeliveryRequest
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def refresh_delivery_user_caches(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Propagate a user's email and first name to the delivery requests that cache them.
+    """
+    if created:
+        return
+    
+    if update_fields is not None and not {'email', 'first_name'} & set(update_fields):
+        return
+    
+    DeliveryRequest.objects.filter(customer=instance).exclude(
+        customer_email_cache=instance.email
+    ).update(customer_email_cache=instance.email)
+    
+    DeliveryRequest.objects.filter(driver=instance).exclude(
+        driver_email_cache=instance.email,
+        driver_name_cache=instance.first_name
+    ).update(driver_email_cache=instance.email, driver_name_cache=instance.first_name)
+
+
+@receiver(pre_delete, sender=User)
+def clear_deleted_driver_caches(sender, instance, **kwargs):
+    """
+    Blank the cached driver fields on requests whose driver is being deleted.
+    
+    The driver foreign key is nulled with a queryset update that skips save(),
+    so the cached email and name would otherwise outlive the user.
+    """
+    DeliveryRequest.objects.filter(driver=instance).update(driver_email_cache=None, driver_name_cache=None)
+
+
+# User fields that appear in, or decide membership of, the partner list
+PARTNER_USER_FIELDS = frozenset({'first_name', 'last_name', 'username', 'email', 'phone', 'role'})
+
+
+@receiver(post_save, sender=DeliveryRequest)
+@receiver(post_delete, sender=DeliveryRequest)
+def invalidate_partner_cache(sender, **kwargs):
+    """
+    Drop the cached partner list when a delivery request changes.
+    """
+    invalidate_partners()
+
+
+@receiver(post_save, sender=DeliveryRequest)
+@receiver(post_delete, sender=DeliveryRequest)
+def invalidate_statistics_cache(sender, instance, **kwargs):
+    """
+    Drop the cached statistics of everyone a delivery request counts towards.
+    """
+    # A reassignment also changes the numbers of the driver it was taken from
+    invalidate_statistics(instance.customer_id, instance.driver_id, getattr(instance, 'loaded_driver_id', None))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_partner_cache_for_user(sender, update_fields=None, **kwargs):
+    """
+    Drop the cached partner list when a user's partner details may have changed.
+    """
+    # Saves such as the last_login update on sign-in leave the list as it is
+    if update_fields is not None and not PARTNER_USER_FIELDS & set(update_fields):
+        return
+    
+    invalidate_partners()
\ No newline at end of file
@@ -1,12 +1,17 @@
 """
 Tests for delivery app functionality.
 """
+from unittest import mock
+from django.db import IntegrityError
 from django.test import TestCase
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
 from rest_framework import status
 from django.urls import reverse
-from .models import DeliveryRequest, SyncLog
+from .models import DeliveryRequest, Route, SyncLog
+from .permissions import IsOwnerOrAdmin
+from .serializers import SyncRequestSerializer, fast_parse_sync_requests
 from django.utils import timezone
 
 User = get_user_model()
@@ -15,8 +20,9 @@ User = get_user_model()
 class DeliveryRequestModelTest(TestCase):
     """Test cases for DeliveryRequest model."""
     
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             email='test@example.com',
             username='testuser',
             password='testpass123',
@@ -68,20 +74,127 @@ class DeliveryRequestModelTest(TestCase):
         self.assertFalse(delivery.pending_sync)
         self.assertEqual(delivery.sync_status, 'synced')
         self.assertIsNotNone(delivery.synced_at)
+    
+    def test_user_caches_follow_ids_and_deleted_driver(self):
+        """Test that the cached user fields follow ids set directly and a deleted driver."""
+        customer = User.objects.create_user(
+            email='customer@example.com',
+            username='customer',
+            password='testpass123',
+            role='customer'
+        )
+        driver = User.objects.create_user(
+            email='driver@example.com',
+            username='driver',
+            password='testpass123',
+            first_name='Dan',
+            role='driver'
+        )
+        delivery = DeliveryRequest.objects.create(
+            pickup_address='123 Main St',
+            dropoff_address='456 Oak Ave',
+            customer_name='John Doe',
+            customer_phone='+1234567890',
+            customer_id=customer.id,
+            driver_id=driver.id
+        )
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.customer_email_cache, 'customer@example.com')
+        self.assertEqual(delivery.driver_email_cache, 'driver@example.com')
+        self.assertEqual(delivery.driver_name_cache, 'Dan')
+        
+        driver.delete()
+        delivery.refresh_from_db()
+        self.assertIsNone(delivery.driver_email_cache)
+        self.assertIsNone(delivery.driver_name_cache)
+    
+    def test_route_numeric_columns_follow_edited_strings(self):
+        """Test that editing a route's display strings re-derives its numeric columns."""
+        customer = User.objects.create_user(
+            email='customer@example.com',
+            username='customer',
+            password='testpass123',
+            role='customer'
+        )
+        delivery = DeliveryRequest.objects.create(
+            pickup_address='123 Main St',
+            dropoff_address='456 Oak Ave',
+            customer_name='John Doe',
+            customer_phone='+1234567890',
+            customer=customer
+        )
+        route = Route.objects.create(delivery_request=delivery, distance='2.5 km', duration='8 mins', polyline='')
+        self.assertEqual((route.distance_meters, route.duration_seconds), (2500, 480))
+        
+        route.distance = '10 km'
+        route.duration = '1 hour 5 mins'
+        route.save()
+        route.refresh_from_db()
+        self.assertEqual((route.distance_meters, route.duration_seconds), (10000, 3900))
+
+
+class IsOwnerOrAdminPermissionTest(TestCase):
+    """Test cases for the object-level ownership permission."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user(
+            email='customer@example.com',
+            username='customer',
+            password='testpass123',
+            role='customer'
+        )
+        cls.driver = User.objects.create_user(
+            email='driver@example.com',
+            username='driver',
+            password='testpass123',
+            role='driver'
+        )
+        cls.other_customer = User.objects.create_user(
+            email='other@example.com',
+            username='other',
+            password='testpass123',
+            role='customer'
+        )
+        cls.delivery = DeliveryRequest.objects.create(
+            pickup_address='123 Main St',
+            dropoff_address='456 Oak Ave',
+            customer_name='John Doe',
+            customer_phone='+1234567890',
+            customer=cls.customer,
+            driver=cls.driver
+        )
+    
+    def _has_permission(self, user):
+        request = APIRequestFactory().get('/')
+        request.user = user
+        delivery = DeliveryRequest.objects.get(pk=self.delivery.pk)
+        with self.assertNumQueries(0):
+            return IsOwnerOrAdmin().has_object_permission(request, None, delivery)
+    
+    def test_owner_check_does_not_fetch_related_users(self):
+        """Test that ownership is decided from the FK ids without extra queries."""
+        self.assertTrue(self._has_permission(self.customer))
+        self.assertTrue(self._has_permission(self.driver))
+        self.assertFalse(self._has_permission(self.other_customer))
 
 
 class DeliveryRequestAPITest(APITestCase):
     """Test cases for delivery request API endpoints."""
     
-    def setUp(self):
-        self.client = APIClient()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             email='test@example.com',
             username='testuser',
             password='testpass123',
             role='driver'
         )
+    
+    def setUp(self):
+        self.client = APIClient()
         self.client.force_authenticate(user=self.user)
+        cache.clear()
     
     def test_create_delivery_request(self):
         """Test creating a delivery request via API."""
@@ -124,6 +237,65 @@ class DeliveryRequestAPITest(APITestCase):
         self.assertTrue(delivery.pending_sync)
         self.assertEqual(delivery.sync_status, 'pending')
     
+    def test_create_rejects_malformed_coordinates(self):
+        """Test that coordinates must be a dict of complete pickup and dropoff points."""
+        customer = User.objects.create_user(
+            email='customer@example.com',
+            username='customer',
+            password='testpass123',
+            role='customer'
+        )
+        self.client.force_authenticate(user=customer)
+        url = reverse('delivery-requests')
+        data = {
+            'pickup_address': '123 Main St',
+            'dropoff_address': '456 Oak Ave',
+            'customer_name': 'John Doe',
+            'customer_phone': '+1234567890'
+        }
+        dropoff = {'latitude': 37.78925, 'longitude': -122.4344}
+        
+        for coordinates in (
+            'garbage',
+            None,
+            {'pickup': 'garbage', 'dropoff': dropoff},
+            {'pickup': {'latitude': 37.78825}, 'dropoff': dropoff},
+            {'dropoff': dropoff},
+            {'pickup': {'latitude': 91, 'longitude': -122}, 'dropoff': dropoff},
+            {'pickup': {'latitude': 37.78825, 'longitude': -1000.5}, 'dropoff': dropoff},
+        ):
+            response = self.client.post(url, {**data, 'coordinates': coordinates}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, coordinates)
+            self.assertIn('coordinates', response.data)
+        
+        self.assertEqual(DeliveryRequest.objects.count(), 0)
+    
+    def test_debug_list_counts_every_request(self):
+        """Test that the debug listing's total covers requests beyond the first page."""
+        admin = User.objects.create_user(
+            email='admin@example.com',
+            username='admin',
+            password='testpass123',
+            role='admin'
+        )
+        self.client.force_authenticate(user=admin)
+        DeliveryRequest.objects.bulk_create([
+            DeliveryRequest(
+                pickup_address='123 Main St',
+                dropoff_address='456 Oak Ave',
+                customer_name='John Doe',
+                customer_phone='+1234567890',
+                customer=admin
+            )
+            for _ in range(12)
+        ])
+        
+        response = self.client.get(reverse('debug-requests'))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']['requests']), 10)
+        self.assertEqual(response.data['data']['total_count'], 12)
+    
     def test_list_delivery_requests(self):
         """Test listing delivery requests."""
         # Create test delivery requests
@@ -159,19 +331,52 @@ class DeliveryRequestAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         delivery.refresh_from_db()
         self.assertEqual(delivery.status, 'in_progress')
+    
+    def test_driver_statistics_cache_invalidated_on_reassignment(self):
+        """Test that reassigning a delivery refreshes the previous driver's cached statistics."""
+        customer = User.objects.create_user(
+            email='customer@example.com',
+            username='customer',
+            password='testpass123',
+            role='customer'
+        )
+        other_driver = User.objects.create_user(
+            email='other@example.com',
+            username='other',
+            password='testpass123',
+            role='driver'
+        )
+        delivery = DeliveryRequest.objects.create(
+            pickup_address='123 Main St',
+            dropoff_address='456 Oak Ave',
+            customer_name='John Doe',
+            customer_phone='+1234567890',
+            customer=customer,
+            driver=self.user
+        )
+        url = reverse('driver-statistics')
+        response = self.client.get(url)
+        self.assertEqual(response.data['data']['totalDeliveries'], 1)
+        
+        DeliveryRequest.objects.get(pk=delivery.pk).assign_driver(other_driver)
+        response = self.client.get(url)
+        self.assertEqual(response.data['data']['totalDeliveries'], 0)
 
 
 class SyncAPITest(APITestCase):
     """Test cases for sync functionality."""
     
-    def setUp(self):
-        self.client = APIClient()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             email='test@example.com',
             username='testuser',
             password='testpass123',
             role='driver'
         )
+    
+    def setUp(self):
+        self.client = APIClient()
         self.client.force_authenticate(user=self.user)
     
     def test_sync_pending_requests(self):
@@ -218,6 +423,155 @@ class SyncAPITest(APITestCase):
         # Check that sync log was created
         self.assertEqual(SyncLog.objects.count(), 1)
     
+    def test_sync_matches_existing_request_by_local_id(self):
+        """Test that resyncing a local ID updates the request it created."""
+        customer = User.objects.create_user(
+            email='customer@example.com',
+            username='customer',
+            password='testpass123',
+            role='customer'
+        )
+        self.client.force_authenticate(user=customer)
+        url = reverse('sync-pending')
+        item = {
+            'local_id': 'local_123',
+            'pickup_address': '123 Main St',
+            'dropoff_address': '456 Oak Ave',
+            'customer_name': 'John Doe',
+            'customer_phone': '+1234567890',
+            'pending_sync': True
+        }
+        
+        first = self.client.post(url, {'requests': [item]}, format='json')
+        item.update(pickup_address='789 Pine St', delivery_note='Updated note')
+        second = self.client.post(url, {'requests': [item]}, format='json')
+        
+        server_id = first.data['data']['synced'][0]['serverId']
+        self.assertEqual(second.data['data']['synced'][0]['serverId'], server_id)
+        self.assertEqual(DeliveryRequest.objects.filter(customer=customer).count(), 1)
+        self.assertEqual(DeliveryRequest.objects.get(pk=server_id).delivery_note, 'Updated note')
+    
+    def test_sync_creates_each_identical_item_without_local_id(self):
+        """Test that identical items without a local ID each create a request."""
+        customer = User.objects.create_user(
+            email='customer@example.com',
+            username='customer',
+            password='testpass123',
+            role='customer'
+        )
+        self.client.force_authenticate(user=customer)
+        item = {
+            'pickup_address': '123 Main St',
+            'dropoff_address': '456 Oak Ave',
+            'customer_name': 'John Doe',
+            'customer_phone': '+1234567890',
+            'pending_sync': True
+        }
+        
+        response = self.client.post(reverse('sync-pending'), {'requests': [item, item]}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']['synced']), 2)
+        self.assertEqual(DeliveryRequest.objects.filter(customer=customer).count(), 2)
+        self.assertEqual(SyncLog.objects.count(), 2)
+    
+    def test_sync_keeps_same_detail_items_with_different_local_ids_apart(self):
+        """Test that orders sharing their details but not their local ID stay separate."""
+        customer = User.objects.create_user(
+            email='customer@example.com',
+            username='customer',
+            password='testpass123',
+            role='customer'
+        )
+        self.client.force_authenticate(user=customer)
+        url = reverse('sync-pending')
+        item = {
+            'pickup_address': '123 Main St',
+            'customer_name': 'John Doe',
+            'customer_phone': '+1234567890',
+            'pending_sync': True
+        }
+        first = {**item, 'local_id': 'L1', 'dropoff_address': '456 Oak Ave'}
+        second = {**item, 'local_id': 'L2', 'dropoff_address': '789 Pine St'}
+        
+        self.client.post(url, {'requests': [first]}, format='json')
+        response = self.client.post(url, {'requests': [second, first]}, format='json')
+        
+        synced = {entry['localId']: entry['serverId'] for entry in response.data['data']['synced']}
+        self.assertNotEqual(synced['L1'], synced['L2'])
+        self.assertEqual(DeliveryRequest.objects.get(pk=synced['L1']).dropoff_address, '456 Oak Ave')
+        self.assertEqual(DeliveryRequest.objects.get(pk=synced['L2']).dropoff_address, '789 Pine St')
+    
+    def test_sync_saves_items_one_by_one_when_bulk_write_fails(self):
+        """Test that a rejected bulk write falls back to saving each item."""
+        customer = User.objects.create_user(
+            email='customer@example.com',
+            username='customer',
+            password='testpass123',
+            role='customer'
+        )
+        self.client.force_authenticate(user=customer)
+        item = {
+            'pickup_address': '123 Main St',
+            'dropoff_address': '456 Oak Ave',
+            'customer_name': 'John Doe',
+            'customer_phone': '+1234567890',
+            'pending_sync': True
+        }
+        requests = [{**item, 'local_id': 'L1'}, {**item, 'local_id': 'L2'}]
+        
+        with mock.patch.object(DeliveryRequest.objects, 'bulk_create', side_effect=IntegrityError('conflict')):
+            response = self.client.post(reverse('sync-pending'), {'requests': requests}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']['synced']), 2)
+        self.assertEqual(response.data['data']['failed'], [])
+        self.assertEqual(DeliveryRequest.objects.filter(customer=customer).count(), 2)
+        self.assertEqual(SyncLog.objects.count(), 2)
+    
+    def test_fast_parse_matches_serializer(self):
+        """Test that the sync fast path validates like SyncRequestSerializer."""
+        item = {
+            'local_id': 'local_123',
+            'pickup_address': '123 Main St',
+            'dropoff_address': '456 Oak Ave',
+            'customer_name': 'John Doe',
+            'customer_phone': '+1234567890',
+            'delivery_note': '',
+            'pending_sync': True,
+            'coordinates': {
+                'pickup': {'latitude': 37.78825, 'longitude': -122},
+                'dropoff': {'latitude': 37.78925, 'longitude': -122.4344}
+            }
+        }
+        serializer = SyncRequestSerializer(data={'requests': [item]})
+        self.assertTrue(serializer.is_valid())
+        
+        self.assertEqual(
+            fast_parse_sync_requests({'requests': [item]}),
+            [dict(data) for data in serializer.validated_data['requests']]
+        )
+        
+        # Anything needing coercion or reporting an error goes through the serializer
+        for override in ({'customer_name': ' John '}, {'pending_sync': 'true'}, {'customer_phone': ''}):
+            self.assertIsNone(fast_parse_sync_requests({'requests': [{**item, **override}]}))
+        
+        # Malformed coordinates are rejected by the serializer, so the fast path defers to it
+        dropoff = item['coordinates']['dropoff']
+        for coordinates in (
+            None,
+            'garbage',
+            {'pickup': {'latitude': None, 'longitude': -122}, 'dropoff': dropoff},
+            {'pickup': 'garbage', 'dropoff': dropoff},
+            {'pickup': {'latitude': 37.78825}, 'dropoff': dropoff},
+            {'dropoff': dropoff},
+            {'pickup': {'latitude': 91, 'longitude': -122}, 'dropoff': dropoff},
+            {'pickup': {'latitude': 37.78825, 'longitude': -1000.5}, 'dropoff': dropoff},
+        ):
+            invalid_item = {**item, 'coordinates': coordinates}
+            self.assertIsNone(fast_parse_sync_requests({'requests': [invalid_item]}))
+            self.assertFalse(SyncRequestSerializer(data={'requests': [invalid_item]}).is_valid())
+    
     def test_sync_status(self):
         """Test getting sync status."""
         # Create pending delivery requests
@@ -241,15 +595,19 @@ class SyncAPITest(APITestCase):
 class PartnerAPITest(APITestCase):
     """Test cases for partner selection API."""
     
-    def setUp(self):
-        self.client = APIClient()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             email='test@example.com',
             username='testuser',
             password='testpass123',
             role='admin'
         )
+    
+    def setUp(self):
+        self.client = APIClient()
         self.client.force_authenticate(user=self.user)
+        cache.clear()
     
     def test_get_available_partners(self):
         """Test getting available partners."""
@@ -265,4 +623,46 @@ class PartnerAPITest(APITestCase):
             partner = response.data['data'][0]
             required_fields = ['id', 'name', 'email', 'phone', 'rating', 'distance', 'available']
             for field in required_fields:
-                self.assertIn(field, partner) 
\ No newline at end of file
+                self.assertIn(field, partner)
+    
+    def test_partner_cache_invalidated_on_assignment(self):
+        """Test that assigning a delivery refreshes the cached partner list."""
+        driver = User.objects.create_user(
+            email='driver@example.com',
+            username='driver',
+            password='testpass123',
+            role='driver'
+        )
+        customer = User.objects.create_user(
+            email='customer@example.com',
+            username='customer',
+            password='testpass123',
+            role='customer'
+        )
+        url = reverse('available-partners')
+        response = self.client.get(url)
+        self.assertEqual(response.data['data'][0]['total_deliveries'], 0)
+        
+        DeliveryRequest.objects.create(
+            pickup_address='123 Test St',
+            dropoff_address='456 Test Ave',
+            customer_name='John Doe',
+            customer_phone='+1234567890',
+            customer=customer,
+            driver=driver
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.data['data'][0]['total_deliveries'], 1)
+    
+    def test_partner_cache_invalidated_on_new_driver(self):
+        """Test that a newly registered driver appears in the cached partner list."""
+        url = reverse('available-partners')
+        self.assertEqual(self.client.get(url).data['data'], [])
+        
+        User.objects.create_user(
+            email='driver@example.com',
+            username='driver',
+            password='testpass123',
+            role='driver'
+        )
+        self.assertEqual(len(self.client.get(url).data['data']), 1)
\ No newline at end of file
@@ -1,17 +1,30 @@
 """
 Views for delivery requests and related functionality.
 """
+import logging
 from rest_framework import status, generics, filters
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
-from django.db import models
+from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
+from django.core.cache import cache
+from django.db import DataError, IntegrityError, transaction
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 from .models import DeliveryRequest, Route, Statistics, SyncLog
+from .cache import (
+    PARTNERS_CACHE_TIMEOUT,
+    STATISTICS_CACHE_TIMEOUT,
+    invalidate_partners,
+    invalidate_statistics,
+    partners_cache_key,
+    statistics_cache_key,
+)
+from .pagination import DeliveryRequestCursorPagination
+from .querysets import deliveries_for
 from .serializers import (
     DeliveryRequestSerializer,
     DeliveryRequestCreateSerializer,
@@ -22,6 +35,7 @@ from .serializers import (
     SyncResponseSerializer,
     DirectionsRequestSerializer,
     DirectionsResponseSerializer,
+    fast_parse_sync_requests,
 )
 from .permissions import (
     IsCustomer, IsDriver, IsAdmin, IsCustomerOrAdmin, 
@@ -29,6 +43,33 @@ from .permissions import (
 )
 from django.contrib.auth import get_user_model
 User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+def _day_start(day):
+    """
+    Return the aware datetime at which the given local date starts.
+    """
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _period_q(period, today):
+    """
+    Return the filter selecting deliveries created within a statistics period.
+    
+    'today', 'week' and 'month' count back from the given date; anything else
+    means all time.
+    """
+    # Half-open datetime ranges rather than __date lookups, so the created_at
+    # indexes can serve them
+    if period == 'today':
+        return Q(created_at__gte=_day_start(today),
+                 created_at__lt=_day_start(today + timedelta(days=1)))
+    if period == 'week':
+        return Q(created_at__gte=_day_start(today - timedelta(days=7)))
+    if period == 'month':
+        return Q(created_at__gte=_day_start(today - timedelta(days=30)))
+    return Q()
 
 
 class DeliveryRequestListView(generics.ListCreateAPIView):
@@ -42,23 +83,10 @@ class DeliveryRequestListView(generics.ListCreateAPIView):
     search_fields = ['customer_name', 'pickup_address', 'dropoff_address']
     ordering_fields = ['created_at', 'updated_at', 'status']
     ordering = ['-created_at']
+    pagination_class = DeliveryRequestCursorPagination
     
     def get_queryset(self):
-        user = self.request.user
-        
-        # Admin sees all requests
-        if user.role == 'admin':
-            return DeliveryRequest.objects.all()
-        
-        # Customer sees only their own requests
-        elif user.role == 'customer':
-            return DeliveryRequest.objects.filter(customer=user)
-        
-        # Driver sees only their assigned requests
-        elif user.role == 'driver':
-            return DeliveryRequest.objects.filter(driver=user)
-        
-        return DeliveryRequest.objects.none()
+        return deliveries_for(self.request.user)
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -83,39 +111,24 @@ class DeliveryRequestListView(generics.ListCreateAPIView):
             OpenApiParameter(name='pending_sync', description='Filter by pending sync status', required=False, type=bool),
             OpenApiParameter(name='search', description='Search in customer name and addresses', required=False, type=str),
             OpenApiParameter(name='ordering', description='Order by field (e.g., created_at, -updated_at)', required=False, type=str),
-            OpenApiParameter(name='page', description='Page number', required=False, type=int),
+            OpenApiParameter(name='cursor', description='Pagination cursor from the previous response', required=False, type=str),
         ],
         responses={200: DeliveryRequestSerializer}
     )
     def list(self, request, *args, **kwargs):
+        # Always paginated, so a response never holds more than one page of requests
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
         
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return Response({
-                'success': True,
-                'data': {
-                    'requests': serializer.data,
-                    'pagination': {
-                        'page': self.paginator.page.number,
-                        'limit': self.paginator.page_size,
-                        'total': self.paginator.page.paginator.count,
-                        'totalPages': self.paginator.page.paginator.num_pages,
-                    }
-                }
-            })
-        
-        serializer = self.get_serializer(queryset, many=True)
         return Response({
             'success': True,
             'data': {
                 'requests': serializer.data,
                 'pagination': {
-                    'page': 1,
-                    'limit': len(serializer.data),
-                    'total': len(serializer.data),
-                    'totalPages': 1,
+                    'limit': self.paginator.page_size,
+                    'next': self.paginator.get_next_link(),
+                    'previous': self.paginator.get_previous_link(),
                 }
             }
         })
@@ -174,19 +187,12 @@ class DeliveryRequestListView(generics.ListCreateAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        # Set customer and sync status
-        data = serializer.validated_data
-        data['customer'] = request.user
-        
-        if data.get('pending_sync', False):
-            data['sync_status'] = 'pending'
-        
-        delivery_request = serializer.save()
+        # The serializer sets the sync status from pending_sync
+        serializer.save(customer=request.user)
         
-        response_serializer = DeliveryRequestSerializer(delivery_request)
         return Response({
             'success': True,
-            'data': response_serializer.data
+            'data': serializer.data
         }, status=status.HTTP_201_CREATED)
 
 
@@ -198,21 +204,7 @@ class DeliveryRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
     
     def get_queryset(self):
-        user = self.request.user
-        
-        # Admin sees all requests
-        if user.role == 'admin':
-            return DeliveryRequest.objects.all()
-        
-        # Customer sees only their own requests
-        elif user.role == 'customer':
-            return DeliveryRequest.objects.filter(customer=user)
-        
-        # Driver sees only their assigned requests
-        elif user.role == 'driver':
-            return DeliveryRequest.objects.filter(driver=user)
-        
-        return DeliveryRequest.objects.none()
+        return deliveries_for(self.request.user)
     
     def get_serializer_class(self):
         if self.request.method == 'PATCH':
@@ -259,26 +251,23 @@ class DeliveryRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
         serializer = self.get_serializer(instance, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         
-        # Handle driver assignment
+        # Handle driver assignment; the serializer has already loaded the driver
         if 'driver' in serializer.validated_data and request.user.role == 'admin':
-            driver_id = serializer.validated_data.pop('driver')
-            try:
-                driver = User.objects.get(id=driver_id, role='driver')
-                instance.assign_driver(driver, assigned_by=request.user)
-            except User.DoesNotExist:
-                return Response({
-                    'success': False,
-                    'error': 'Driver not found'
-                }, status=status.HTTP_400_BAD_REQUEST)
-        
-        serializer.save()
+            driver = serializer.validated_data.pop('driver')
+            instance.assign_driver(driver, assigned_by=request.user)
+            
+            # assign_driver has saved; only save again if other fields changed
+            if serializer.validated_data:
+                serializer.save()
+        else:
+            serializer.save()
         
         return Response({
             'success': True,
             'data': {
                 'id': instance.id,
                 'status': instance.status,
-                'driver': instance.driver.id if instance.driver else None,
+                'driver': instance.driver_id,
                 'updatedAt': instance.updated_at,
             }
         })
@@ -309,9 +298,10 @@ class AssignedDeliveryRequestListView(generics.ListAPIView):
     search_fields = ['customer_name', 'pickup_address', 'dropoff_address']
     ordering_fields = ['created_at', 'updated_at', 'status']
     ordering = ['-created_at']
+    pagination_class = DeliveryRequestCursorPagination
     
     def get_queryset(self):
-        return DeliveryRequest.objects.filter(
+        return DeliveryRequestSerializer.setup_eager_loading(DeliveryRequest.objects.all()).filter(
             driver=self.request.user,
             status__in=['assigned', 'in_progress']
         )
@@ -323,34 +313,19 @@ class AssignedDeliveryRequestListView(generics.ListAPIView):
         responses={200: DeliveryRequestSerializer}
     )
     def list(self, request, *args, **kwargs):
+        # Always paginated, so a response never holds more than one page of requests
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
         
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return Response({
-                'success': True,
-                'data': {
-                    'requests': serializer.data,
-                    'pagination': {
-                        'page': self.paginator.page.number,
-                        'limit': self.paginator.page_size,
-                        'total': self.paginator.page.paginator.count,
-                        'totalPages': self.paginator.page.paginator.num_pages,
-                    }
-                }
-            })
-        
-        serializer = self.get_serializer(queryset, many=True)
         return Response({
             'success': True,
             'data': {
                 'requests': serializer.data,
                 'pagination': {
-                    'page': 1,
-                    'limit': len(serializer.data),
-                    'total': len(serializer.data),
-                    'totalPages': 1,
+                    'limit': self.paginator.page_size,
+                    'next': self.paginator.get_next_link(),
+                    'previous': self.paginator.get_previous_link(),
                 }
             }
         })
@@ -397,47 +372,76 @@ def get_available_partners(request):
     """
     Get available delivery partners (drivers) for assignment.
     """
-    # Get all users who are drivers
-    drivers = User.objects.filter(role='driver')
+    available_only = request.query_params.get('available_only', 'false').lower() == 'true'
+    partners = cache.get_or_set(
+        partners_cache_key(available_only),
+        lambda: _compute_partners(available_only),
+        PARTNERS_CACHE_TIMEOUT
+    )
+    
+    return Response({
+        'success': True,
+        'data': partners
+    })
+
+
+def _compute_partners(available_only):
+    """
+    Build the sorted partner list for get_available_partners.
+    """
+    # Get all users who are drivers, with their delivery counts
+    drivers = User.objects.filter(role='driver').annotate(
+        total_deliveries=Count('driver_deliveries'),
+        completed_deliveries=Count('driver_deliveries', filter=Q(driver_deliveries__status='completed')),
+        active_deliveries=Count(
+            'driver_deliveries',
+            filter=Q(driver_deliveries__status__in=['assigned', 'in_progress'])
+        )
+    )
     
     # Filter by availability if requested
-    available_only = request.query_params.get('available_only', 'false').lower() == 'true'
     if available_only:
         # Get drivers who have less than 5 active deliveries
-        drivers = drivers.annotate(
-            active_deliveries=models.Count(
-                'driver_deliveries',
-                filter=models.Q(driver_deliveries__status__in=['assigned', 'in_progress'])
-            )
-        ).filter(active_deliveries__lt=5)
+        drivers = drivers.filter(active_deliveries__lt=5)
+    
+    # Available drivers (fewer than 3 active deliveries) first, then by rating,
+    # which only grows with completed deliveries
+    drivers = drivers.annotate(
+        unavailable=Case(
+            When(active_deliveries__lt=3, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField()
+        )
+    ).order_by('unavailable', '-completed_deliveries', 'id').annotate(
+        # Full name, or the username when both name fields are empty
+        display_name=Coalesce(
+            NullIf(Trim(Concat('first_name', Value(' '), 'last_name')), Value('')),
+            'username'
+        )
+    ).values(
+        'id', 'display_name', 'email', 'phone',
+        'total_deliveries', 'completed_deliveries', 'active_deliveries'
+    )
     
     partners = []
     for driver in drivers:
-        # Calculate driver statistics
-        total_deliveries = DeliveryRequest.objects.filter(driver=driver).count()
-        completed_deliveries = DeliveryRequest.objects.filter(
-            driver=driver, 
-            status='completed'
-        ).count()
-        
-        # Calculate active deliveries
-        active_deliveries = DeliveryRequest.objects.filter(
-            driver=driver,
-            status__in=['assigned', 'in_progress']
-        ).count()
+        driver_id = driver['id']
+        total_deliveries = driver['total_deliveries']
+        completed_deliveries = driver['completed_deliveries']
+        active_deliveries = driver['active_deliveries']
         
         # Determine availability (available if less than 3 active deliveries)
         available = active_deliveries < 3
         
         # Mock rating and distance (in real implementation, these would be calculated)
         rating = 4.5 + (completed_deliveries * 0.01)  # Simple rating calculation
-        distance = f"{2 + (driver.id % 5)}.{(driver.id % 10)} km"  # Mock distance
+        distance = f"{2 + (driver_id % 5)}.{(driver_id % 10)} km"  # Mock distance
         
         partners.append({
-            'id': driver.id,
-            'name': f"{driver.first_name} {driver.last_name}".strip() or driver.username,
-            'email': driver.email,
-            'phone': driver.phone or 'N/A',
+            'id': driver_id,
+            'name': driver['display_name'],
+            'email': driver['email'],
+            'phone': driver['phone'] or 'N/A',
             'rating': round(rating, 1),
             'distance': distance,
             'available': available,
@@ -446,13 +450,7 @@ def get_available_partners(request):
             'active_deliveries': active_deliveries
         })
     
-    # Sort by availability and rating
-    partners.sort(key=lambda x: (not x['available'], -x['rating']))
-    
-    return Response({
-        'success': True,
-        'data': partners
-    })
+    return partners
 
 
 @extend_schema(
@@ -504,6 +502,40 @@ def directions_view(request):
     })
 
 
+def _save_sync_items(processed, update_fields, failed):
+    """
+    Save synced requests and their logs one at a time, each in its own savepoint.
+    
+    Items the database rejects are appended to ``failed``; the rest are returned.
+    """
+    saved = []
+    for local_id, delivery_request in processed:
+        adding = delivery_request._state.adding
+        try:
+            with transaction.atomic():
+                if adding:
+                    delivery_request.save()
+                else:
+                    delivery_request.save(update_fields=update_fields)
+                SyncLog.objects.create(
+                    delivery_request=delivery_request,
+                    status='success',
+                    message=f'Successfully synced request ID: {delivery_request.id}'
+                )
+        except (DataError, IntegrityError) as e:
+            if adding:
+                delivery_request.pk = None
+                delivery_request._state.adding = True
+            failed.append({
+                'localId': local_id or f'local_{len(failed) + 1}',
+                'error': str(e)
+            })
+            logger.warning("Failed to sync - Local ID: %s, Error: %s", local_id, e)
+        else:
+            saved.append((local_id, delivery_request))
+    return saved
+
+
 @extend_schema(
     tags=['sync'],
     summary='Sync Pending Requests',
@@ -545,91 +577,174 @@ def sync_pending_view(request):
     """
     View for syncing pending delivery requests.
     """
-    serializer = SyncRequestSerializer(data=request.data)
-    serializer.is_valid(raise_exception=True)
+    requests_data = fast_parse_sync_requests(request.data)
+    if requests_data is None:
+        serializer = SyncRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        requests_data = serializer.validated_data['requests']
     
-    requests_data = serializer.validated_data['requests']
     synced = []
     failed = []
     conflicts = []
     
+    # Fields that a sync may overwrite on an existing request
+    updateable_fields = [
+        'dropoff_address', 'customer_name', 'customer_phone', 
+        'delivery_note', 'pickup_latitude', 'pickup_longitude',
+        'dropoff_latitude', 'dropoff_longitude', 'status'
+    ]
+    
+    # Requests are collected here and written with one bulk query each
+    now = timezone.now()
+    to_create = []
+    to_update = {}
+    processed = []
+    customer = request.user if request.user.role == 'customer' else None
+    
+    # Look up every request already synced under one of the incoming local IDs in one query
+    local_ids = [item['local_id'] for item in requests_data if item.get('local_id')]
+    existing_by_local_id = {}
+    if local_ids:
+        existing_by_local_id = {
+            delivery_request.local_id: delivery_request
+            for delivery_request in DeliveryRequest.objects.filter(customer=request.user, local_id__in=local_ids)
+        }
+    
+    # Requests synced before local IDs were stored have none; they are matched on
+    # their details instead, also in one query
+    unmatched_details = {
+        (item.get('customer_name'), item.get('customer_phone'), item.get('pickup_address'))
+        for item in requests_data
+        if item.get('local_id') and item['local_id'] not in existing_by_local_id
+    }
+    existing_by_details = {}
+    if unmatched_details:
+        details = Q()
+        for customer_name, customer_phone, pickup_address in unmatched_details:
+            details |= Q(customer_name=customer_name, customer_phone=customer_phone, pickup_address=pickup_address)
+        # A range on created_at can use the index; casting it to a date cannot
+        today_start = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        for delivery_request in DeliveryRequest.objects.filter(
+            details,
+            customer=request.user,
+            local_id__isnull=True,
+            created_at__gte=today_start,
+            created_at__lt=today_start + timedelta(days=1)
+        ):
+            # Rows come newest first; keep the newest match for each key
+            existing_by_details.setdefault(
+                (delivery_request.customer_name, delivery_request.customer_phone, delivery_request.pickup_address),
+                delivery_request
+            )
+    
     for request_data in requests_data:
+        local_id = request_data.get('local_id')
         try:
-            # Extract coordinates and local_id before creating/updating
-            coordinates = request_data.pop('coordinates', {})
+            # Extract local_id before updating; new requests store it
             local_id = request_data.pop('local_id', None)
             
-            # Extract coordinate values
-            pickup_coords = coordinates.get('pickup', {})
-            dropoff_coords = coordinates.get('dropoff', {})
-            
-            # Add coordinate fields to request_data
-            if pickup_coords:
-                request_data['pickup_latitude'] = pickup_coords.get('latitude')
-                request_data['pickup_longitude'] = pickup_coords.get('longitude')
-            
-            if dropoff_coords:
-                request_data['dropoff_latitude'] = dropoff_coords.get('latitude')
-                request_data['dropoff_longitude'] = dropoff_coords.get('longitude')
-            
             # Set customer for new requests
-            if request.user.role == 'customer':
-                request_data['customer'] = request.user
+            if customer is not None:
+                request_data['customer'] = customer
             
-            # Check if request already exists
+            # Check if request already exists, either in the database or earlier in this batch
             existing_request = None
             if local_id:
-                # Try to find existing request by local ID or other unique identifier
-                existing_request = DeliveryRequest.objects.filter(
-                    customer=request.user,
-                    customer_name=request_data.get('customer_name'),
-                    customer_phone=request_data.get('customer_phone'),
-                    pickup_address=request_data.get('pickup_address'),
-                    created_at__date=timezone.now().date()
-                ).first()
+                existing_request = existing_by_local_id.get(local_id)
+                if existing_request is None:
+                    # A legacy request is claimed by the first local ID that matches it
+                    existing_request = existing_by_details.pop((
+                        request_data.get('customer_name'),
+                        request_data.get('customer_phone'),
+                        request_data.get('pickup_address'),
+                    ), None)
+                    if existing_request is not None:
+                        existing_request.local_id = local_id
+                        existing_by_local_id[local_id] = existing_request
             
             if existing_request:
                 # Update existing request - only update fields that can be set
-                updateable_fields = [
-                    'dropoff_address', 'customer_name', 'customer_phone', 
-                    'delivery_note', 'pickup_latitude', 'pickup_longitude',
-                    'dropoff_latitude', 'dropoff_longitude', 'status'
-                ]
-                
                 for field in updateable_fields:
                     if field in request_data and hasattr(existing_request, field):
                         setattr(existing_request, field, request_data[field])
                 
-                existing_request.mark_as_synced()
+                existing_request.sync_status = 'synced'
+                existing_request.pending_sync = False
+                existing_request.synced_at = now
+                if existing_request.pk:
+                    to_update[existing_request.pk] = existing_request
+                    logger.debug("Updated existing request ID: %s", existing_request.id)
                 delivery_request = existing_request
-                print(f"Updated existing request ID: {delivery_request.id}")
             else:
-                # Create new request
-                delivery_request = DeliveryRequest.objects.create(**request_data)
-                delivery_request.mark_as_synced()
-                print(f"Created new request ID: {delivery_request.id}")
-            
-            # Log sync
-            SyncLog.objects.create(
-                delivery_request=delivery_request,
-                status='success',
-                message=f'Successfully synced request ID: {delivery_request.id}'
-            )
-            
-            synced.append({
-                'localId': local_id or f'local_{delivery_request.id}',
-                'serverId': delivery_request.id,
-                'status': 'synced'
-            })
+                if 'customer' not in request_data:
+                    raise ValueError('Only customers can create delivery requests')
+                
+                # Create new request, already marked as synced
+                request_data.update(local_id=local_id, sync_status='synced', pending_sync=False, synced_at=now)
+                delivery_request = DeliveryRequest(**request_data)
+                delivery_request.refresh_user_caches()
+                to_create.append(delivery_request)
+                if local_id:
+                    existing_by_local_id[local_id] = delivery_request
             
-            print(f"Synced - Local ID: {local_id}, Server ID: {delivery_request.id}")
+            processed.append((local_id, delivery_request))
             
         except Exception as e:
             failed.append({
                 'localId': local_id or f'local_{len(failed) + 1}',
                 'error': str(e)
             })
-            print(f"Failed to sync - Local ID: {local_id}, Error: {str(e)}")
+            logger.warning("Failed to sync - Local ID: %s, Error: %s", local_id, e)
+    
+    # Write the whole batch in one transaction, so it commits once
+    sync_fields = updateable_fields + ['local_id', 'sync_status', 'pending_sync', 'synced_at', 'updated_at']
+    if processed:
+        try:
+            with transaction.atomic():
+                if to_create:
+                    DeliveryRequest.objects.bulk_create(to_create, batch_size=500)
+                    logger.debug("Created %d new requests", len(to_create))
+                
+                if to_update:
+                    for delivery_request in to_update.values():
+                        delivery_request.updated_at = now
+                    DeliveryRequest.objects.bulk_update(to_update.values(), fields=sync_fields, batch_size=500)
+                
+                # Log sync
+                SyncLog.objects.bulk_create([
+                    SyncLog(
+                        delivery_request=delivery_request,
+                        status='success',
+                        message=f'Successfully synced request ID: {delivery_request.id}'
+                    )
+                    for _, delivery_request in processed
+                ], batch_size=500)
+        except (DataError, IntegrityError) as e:
+            # A row was rejected, such as a local ID synced concurrently; the batch
+            # was rolled back, so save item by item and fail only the rejected ones
+            logger.warning("Bulk sync rejected, saving items one by one: %s", e)
+            for delivery_request in to_create:
+                delivery_request.pk = None
+                delivery_request._state.adding = True
+            processed = _save_sync_items(processed, sync_fields, failed)
+    
+    # Bulk writes skip the model signals that normally refresh these caches
+    if to_create or to_update:
+        invalidate_partners()
+        invalidate_statistics(*{
+            user_id
+            for delivery_request in [*to_create, *to_update.values()]
+            for user_id in (delivery_request.customer_id, delivery_request.driver_id)
+        })
+    
+    for local_id, delivery_request in processed:
+        synced.append({
+            'localId': local_id or f'local_{delivery_request.id}',
+            'serverId': delivery_request.id,
+            'status': 'synced'
+        })
+        
+        logger.debug("Synced - Local ID: %s, Server ID: %s", local_id, delivery_request.id)
     
     return Response({
         'success': True,
@@ -678,47 +793,36 @@ def sync_status_view(request):
     # Get sync statistics based on user role
     if user.role == 'customer':
         # Customers see their own requests
-        last_sync = SyncLog.objects.filter(
+        last_sync_at = SyncLog.objects.filter(
             delivery_request__customer=user
-        ).order_by('-created_at').first()
-        
-        pending_requests = DeliveryRequest.objects.filter(
-            customer=user, sync_status='pending'
-        )
-        
-        failed_requests = DeliveryRequest.objects.filter(
-            customer=user, sync_status='failed'
-        )
+        ).order_by('-created_at').values_list('created_at', flat=True).first()
         
-        synced_requests = DeliveryRequest.objects.filter(
-            customer=user, sync_status='synced'
-        )
+        deliveries = DeliveryRequest.objects.filter(customer=user)
     else:  # driver
         # Drivers see their assigned requests
-        last_sync = SyncLog.objects.filter(
+        last_sync_at = SyncLog.objects.filter(
             delivery_request__driver=user
-        ).order_by('-created_at').first()
-        
-        pending_requests = DeliveryRequest.objects.filter(
-            driver=user, sync_status='pending'
-        )
-        
-        failed_requests = DeliveryRequest.objects.filter(
-            driver=user, sync_status='failed'
-        )
+        ).order_by('-created_at').values_list('created_at', flat=True).first()
         
-        synced_requests = DeliveryRequest.objects.filter(
-            driver=user, sync_status='synced'
-        )
+        deliveries = DeliveryRequest.objects.filter(driver=user)
+    
+    counts = deliveries.aggregate(
+        pending=Count('id', filter=Q(sync_status='pending')),
+        failed=Count('id', filter=Q(sync_status='failed')),
+        synced=Count('id', filter=Q(sync_status='synced'))
+    )
+    pending_requests = deliveries.filter(sync_status='pending')
     
     return Response({
         'success': True,
         'data': {
-            'lastSync': last_sync.created_at.isoformat() if last_sync else None,
-            'pendingCount': pending_requests.count(),
-            'failedCount': failed_requests.count(),
-            'syncedCount': synced_requests.count(),
-            'pendingRequests': DeliveryRequestSerializer(pending_requests, many=True).data
+            'lastSync': last_sync_at.isoformat() if last_sync_at else None,
+            'pendingCount': counts['pending'],
+            'failedCount': counts['failed'],
+            'syncedCount': counts['synced'],
+            'pendingRequests': DeliveryRequestSerializer(
+                DeliveryRequestSerializer.setup_eager_loading(pending_requests), many=True
+            ).data
         }
     })
 
@@ -762,7 +866,7 @@ def statistics_view(request):
     period = request.query_params.get('period', 'today')
     
     # Calculate date range based on period
-    today = timezone.now().date()
+    today = timezone.localdate()
     if period == 'today':
         start_date = today
         end_date = today
@@ -779,25 +883,35 @@ def statistics_view(request):
         start_date = today
         end_date = today
     
+    # Half-open range on the raw timestamp, so the (user, created_at) indexes apply
+    start = _day_start(start_date)
+    end = _day_start(end_date + timedelta(days=1))
+    
     # Get delivery statistics based on user role
     if user.role == 'customer':
         deliveries = DeliveryRequest.objects.filter(
             customer=user,
-            created_at__date__range=[start_date, end_date]
+            created_at__gte=start,
+            created_at__lt=end
         )
     else:  # driver
         deliveries = DeliveryRequest.objects.filter(
             driver=user,
-            created_at__date__range=[start_date, end_date]
+            created_at__gte=start,
+            created_at__lt=end
         )
     
-    total_deliveries = deliveries.count()
-    completed_deliveries = deliveries.filter(status='completed').count()
-    pending_deliveries = deliveries.filter(status='pending').count()
-    in_progress_deliveries = deliveries.filter(status='in_progress').count()
+    # Count every status in a single query
+    counts = deliveries.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='completed')),
+        pending=Count('id', filter=Q(status='pending')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        distance_meters=Sum('route__distance_meters'),
+    )
+    total_distance = f"{round((counts['distance_meters'] or 0) / 1000, 1):g} km"
     
     # Mock statistics (in real implementation, these would be calculated)
-    total_distance = "450 km"
     total_earnings = 1250.50
     average_rating = 4.8
     on_time_delivery_rate = 95.5
@@ -805,10 +919,10 @@ def statistics_view(request):
     return Response({
         'success': True,
         'data': {
-            'totalDeliveries': total_deliveries,
-            'completedDeliveries': completed_deliveries,
-            'pendingDeliveries': pending_deliveries,
-            'inProgressDeliveries': in_progress_deliveries,
+            'totalDeliveries': counts['total'],
+            'completedDeliveries': counts['completed'],
+            'pendingDeliveries': counts['pending'],
+            'inProgressDeliveries': counts['in_progress'],
             'totalDistance': total_distance,
             'totalEarnings': total_earnings,
             'averageRating': average_rating,
@@ -817,6 +931,30 @@ def statistics_view(request):
     })
 
 
+def _driver_statistics(driver, period):
+    """
+    Aggregate the counts behind driver_statistics_view in a single query.
+    """
+    # Date filters for the requested period and the fixed summary cards
+    today = timezone.localdate()
+    period_q = _period_q(period, today)
+    today_q = _period_q('today', today)
+    week_q = _period_q('week', today)
+    month_q = _period_q('month', today)
+    
+    return DeliveryRequest.objects.filter(driver=driver).aggregate(
+        total=Count('id', filter=period_q),
+        completed=Count('id', filter=period_q & Q(status='completed')),
+        pending=Count('id', filter=period_q & Q(status='pending')),
+        in_progress=Count('id', filter=period_q & Q(status='in_progress')),
+        assigned=Count('id', filter=period_q & Q(status='assigned')),
+        today_completed=Count('id', filter=today_q & Q(status='completed')),
+        today_pending=Count('id', filter=today_q & Q(status__in=['pending', 'assigned'])),
+        week_completed=Count('id', filter=week_q & Q(status='completed')),
+        month_completed=Count('id', filter=month_q & Q(status='completed')),
+    )
+
+
 @extend_schema(
     tags=['statistics'],
     summary='Get Driver Statistics',
@@ -860,71 +998,32 @@ def driver_statistics_view(request):
     driver = request.user
     period = request.query_params.get('period', 'all')
     
-    # Calculate date ranges
-    today = timezone.now().date()
-    week_ago = today - timedelta(days=7)
-    month_ago = today - timedelta(days=30)
-    
-    # Base queryset for this driver
-    driver_deliveries = DeliveryRequest.objects.filter(driver=driver)
-    
-    # Filter by period if specified
-    if period == 'today':
-        deliveries = driver_deliveries.filter(created_at__date=today)
-    elif period == 'week':
-        deliveries = driver_deliveries.filter(created_at__date__gte=week_ago)
-    elif period == 'month':
-        deliveries = driver_deliveries.filter(created_at__date__gte=month_ago)
-    else:  # 'all' or default
-        deliveries = driver_deliveries
-    
-    # Calculate statistics
-    total_deliveries = deliveries.count()
-    completed_deliveries = deliveries.filter(status='completed').count()
-    pending_deliveries = deliveries.filter(status='pending').count()
-    in_progress_deliveries = deliveries.filter(status='in_progress').count()
-    assigned_deliveries = deliveries.filter(status='assigned').count()
-    
-    # Today's statistics
-    today_deliveries = driver_deliveries.filter(created_at__date=today)
-    today_completed = today_deliveries.filter(status='completed').count()
-    today_pending = today_deliveries.filter(status__in=['pending', 'assigned']).count()
-    
-    # Weekly and monthly completed
-    week_completed = driver_deliveries.filter(
-        status='completed',
-        created_at__date__gte=week_ago
-    ).count()
-    
-    month_completed = driver_deliveries.filter(
-        status='completed',
-        created_at__date__gte=month_ago
-    ).count()
-    
-    # Calculate mock earnings (in real implementation, this would be based on actual pricing)
-    earnings_per_delivery = 25.0  # Mock amount
-    total_earnings = completed_deliveries * earnings_per_delivery
-    
-    # Calculate mock rating and on-time rate
-    average_rating = 4.5 + (completed_deliveries * 0.01)  # Simple calculation
-    on_time_delivery_rate = 95.0 + (completed_deliveries * 0.1)  # Mock calculation
+    # Cached per user and period; delivery request changes drop the entry
+    stats = cache.get_or_set(
+        statistics_cache_key('driver', driver.pk, period),
+        lambda: _driver_statistics(driver, period),
+        STATISTICS_CACHE_TIMEOUT
+    )
+    completed_deliveries = stats['completed']
     
-    # Ensure rating doesn't exceed 5.0
-    average_rating = min(average_rating, 5.0)
-    on_time_delivery_rate = min(on_time_delivery_rate, 100.0)
+    # Mock earnings, rating and on-time rate (in real implementation, these would be
+    # based on actual pricing and feedback); rating and rate are capped at 5.0 and 100%
+    total_earnings = completed_deliveries * 25.0
+    average_rating = min(4.5 + completed_deliveries * 0.01, 5.0)
+    on_time_delivery_rate = min(95.0 + completed_deliveries * 0.1, 100.0)
     
     return Response({
         'success': True,
         'data': {
-            'totalDeliveries': total_deliveries,
+            'totalDeliveries': stats['total'],
             'completedDeliveries': completed_deliveries,
-            'pendingDeliveries': pending_deliveries,
-            'inProgressDeliveries': in_progress_deliveries,
-            'assignedDeliveries': assigned_deliveries,
-            'todayCompleted': today_completed,
-            'todayPending': today_pending,
-            'weekCompleted': week_completed,
-            'monthCompleted': month_completed,
+            'pendingDeliveries': stats['pending'],
+            'inProgressDeliveries': stats['in_progress'],
+            'assignedDeliveries': stats['assigned'],
+            'todayCompleted': stats['today_completed'],
+            'todayPending': stats['today_pending'],
+            'weekCompleted': stats['week_completed'],
+            'monthCompleted': stats['month_completed'],
             'totalEarnings': round(total_earnings, 2),
             'averageRating': round(average_rating, 1),
             'onTimeDeliveryRate': round(on_time_delivery_rate, 1),
@@ -933,6 +1032,31 @@ def driver_statistics_view(request):
     })
 
 
+def _customer_statistics(customer, period):
+    """
+    Aggregate the counts behind customer_statistics_view in a single query.
+    """
+    # Date filters for the requested period and the fixed summary cards
+    today = timezone.localdate()
+    period_q = _period_q(period, today)
+    today_q = _period_q('today', today)
+    week_q = _period_q('week', today)
+    month_q = _period_q('month', today)
+    
+    return DeliveryRequest.objects.filter(customer=customer).aggregate(
+        total=Count('id', filter=period_q),
+        completed=Count('id', filter=period_q & Q(status='completed')),
+        pending=Count('id', filter=period_q & Q(status='pending')),
+        in_progress=Count('id', filter=period_q & Q(status='in_progress')),
+        cancelled=Count('id', filter=period_q & Q(status='cancelled')),
+        today_completed=Count('id', filter=today_q & Q(status='completed')),
+        today_pending=Count('id', filter=today_q & Q(status='pending')),
+        week_completed=Count('id', filter=week_q & Q(status='completed')),
+        month_completed=Count('id', filter=month_q & Q(status='completed')),
+        all_time_completed=Count('id', filter=Q(status='completed')),
+    )
+
+
 @extend_schema(
     tags=['statistics'],
     summary='Get Customer Statistics',
@@ -975,76 +1099,38 @@ def customer_statistics_view(request):
     customer = request.user
     period = request.query_params.get('period', 'all')
     
-    # Calculate date ranges
-    today = timezone.now().date()
-    week_ago = today - timedelta(days=7)
-    month_ago = today - timedelta(days=30)
-    
-    # Base queryset for this customer
-    customer_deliveries = DeliveryRequest.objects.filter(customer=customer)
-    
-    # Filter by period if specified
-    if period == 'today':
-        deliveries = customer_deliveries.filter(created_at__date=today)
-    elif period == 'week':
-        deliveries = customer_deliveries.filter(created_at__date__gte=week_ago)
-    elif period == 'month':
-        deliveries = customer_deliveries.filter(created_at__date__gte=month_ago)
-    else:  # 'all' or default
-        deliveries = customer_deliveries
-    
-    # Calculate statistics
-    total_deliveries = deliveries.count()
-    completed_deliveries = deliveries.filter(status='completed').count()
-    pending_deliveries = deliveries.filter(status='pending').count()
-    in_progress_deliveries = deliveries.filter(status='in_progress').count()
-    cancelled_deliveries = deliveries.filter(status='cancelled').count()
-    
-    # Today's statistics
-    today_deliveries = customer_deliveries.filter(created_at__date=today)
-    today_completed = today_deliveries.filter(status='completed').count()
-    today_pending = today_deliveries.filter(status='pending').count()
-    
-    # Weekly and monthly completed
-    week_completed = customer_deliveries.filter(
-        status='completed',
-        created_at__date__gte=week_ago
-    ).count()
-    
-    month_completed = customer_deliveries.filter(
-        status='completed',
-        created_at__date__gte=month_ago
-    ).count()
-    
-    # Calculate average delivery time (mock calculation)
-    completed_deliveries_with_time = customer_deliveries.filter(
-        status='completed',
-        updated_at__isnull=False
+    # Cached per user and period; delivery request changes drop the entry
+    stats = cache.get_or_set(
+        statistics_cache_key('customer', customer.pk, period),
+        lambda: _customer_statistics(customer, period),
+        STATISTICS_CACHE_TIMEOUT
     )
+    completed_deliveries = stats['completed']
     
-    if completed_deliveries_with_time.exists():
+    # Calculate average delivery time (mock calculation); updated_at is always set,
+    # so any completed delivery has a time
+    if stats['all_time_completed']:
         # Mock average delivery time calculation
         avg_hours = 2.5 + (completed_deliveries * 0.1)  # Mock calculation
         average_delivery_time = f"{avg_hours:.1f} hours"
     else:
         average_delivery_time = "N/A"
     
-    # Calculate total spent (mock calculation)
-    base_delivery_cost = 15.0  # Mock base cost
-    total_spent = completed_deliveries * base_delivery_cost
+    # Mock total spent at a flat 15.0 per completed delivery
+    total_spent = completed_deliveries * 15.0
     
     return Response({
         'success': True,
         'data': {
-            'totalDeliveries': total_deliveries,
+            'totalDeliveries': stats['total'],
             'completedDeliveries': completed_deliveries,
-            'pendingDeliveries': pending_deliveries,
-            'inProgressDeliveries': in_progress_deliveries,
-            'cancelledDeliveries': cancelled_deliveries,
-            'todayCompleted': today_completed,
-            'todayPending': today_pending,
-            'weekCompleted': week_completed,
-            'monthCompleted': month_completed,
+            'pendingDeliveries': stats['pending'],
+            'inProgressDeliveries': stats['in_progress'],
+            'cancelledDeliveries': stats['cancelled'],
+            'todayCompleted': stats['today_completed'],
+            'todayPending': stats['today_pending'],
+            'weekCompleted': stats['week_completed'],
+            'monthCompleted': stats['month_completed'],
             'averageDeliveryTime': average_delivery_time,
             'totalSpent': round(total_spent, 2),
             'period': period
@@ -1055,7 +1141,7 @@ def customer_statistics_view(request):
 @extend_schema(
     tags=['debug'],
     summary='Debug - List All Delivery Requests',
-    description='Debug endpoint to view all delivery requests in the database.',
+    description='Debug endpoint to page through all delivery requests in the database, newest first.',
     responses={200: DeliveryRequestSerializer}
 )
 @api_view(['GET'])
@@ -1070,13 +1156,22 @@ def debug_list_all_requests(request):
             'error': 'Only admins can access this endpoint'
         }, status=status.HTTP_403_FORBIDDEN)
     
-    all_requests = DeliveryRequest.objects.all().order_by('-id')
-    serializer = DeliveryRequestSerializer(all_requests, many=True)
+    # One page per call, with the relations the serializer reads joined in;
+    # the total still covers every request, at the cost of one COUNT(*) query
+    paginator = DeliveryRequestCursorPagination()
+    queryset = DeliveryRequestSerializer.setup_eager_loading(DeliveryRequest.objects.all())
+    page = paginator.paginate_queryset(queryset, request)
+    serializer = DeliveryRequestSerializer(page, many=True)
     
     return Response({
         'success': True,
         'data': {
-            'total_count': all_requests.count(),
-            'requests': serializer.data
+            'total_count': queryset.count(),
+            'requests': serializer.data,
+            'pagination': {
+                'limit': paginator.page_size,
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+            }
         }
     }) 
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Request parsers shared by the project's APIs.
+"""
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from .renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSON parser that decodes request bodies with orjson.
+    
+    orjson only reads UTF-8, the encoding JSON bodies are sent in; like the
+    strict JSONParser it rejects NaN and Infinity.
+    """
+    renderer_class = ORJSONRenderer
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,36 @@
+"""
+Response renderers shared by the project's APIs.
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# DRF's encoder still formats the types orjson is told to pass through, so
+# datetimes, decimals and lazy strings render exactly as they did before
+_drf_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that serializes with orjson.
+    
+    Output matches DRF's compact JSONRenderer; indented output, as asked for
+    with an 'indent' media type parameter, is left to the stock renderer.
+    """
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        try:
+            ret = orjson.dumps(data, default=_drf_encoder.default, option=self.options)
+        except orjson.JSONEncodeError:
+            # Values orjson cannot hold, such as integers wider than 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        # Escaped like JSONRenderer does, so the output stays a strict javascript subset
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,10 @@
+"""
+Django settings for running the test suite.
+
+Use with ``python manage.py test --settings=delivery_backend.test_settings``;
+pytest picks it up from pytest.ini.
+"""
+from .settings import *  # noqa: F401,F403
+
+# Password hashing is deliberately slow; tests only need it to round-trip
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
@@ -0,0 +1,20 @@
+"""
+Cache helpers for the users app.
+"""
+from django.core.cache import cache
+
+PROFILE_CACHE_TIMEOUT = 300
+
+
+def profile_cache_key(user_id):
+    """
+    Return the cache key for a user's serialized profile.
+    """
+    return f'user-profile:{user_id}'
+
+
+def invalidate_profile(user_id):
+    """
+    Drop a user's cached profile.
+    """
+    cache.delete(profile_cache_key(user_id))
\ No newline at end of file
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-15 20:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_alter_user_role"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="role",
+            field=models.CharField(
+                choices=[
+                    ("driver", "Driver"),
+                    ("admin", "Admin"),
+                    ("customer", "Customer"),
+                ],
+                db_index=True,
+                default="admin",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -1,11 +1,40 @@
 """
 Custom User model for the delivery app.
 """
-from django.contrib.auth.models import AbstractUser
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 
+class UserManager(BaseUserManager):
+    """
+    User manager with a batch creation path for seeding and load tests.
+    """
+    def bulk_create_users(self, users, batch_size=500):
+        """
+        Create users from dicts of field values, each with a plaintext 'password'.
+        
+        Password hashing dominates the cost of creating a user, and the hashers
+        release the GIL, so the passwords are hashed on a thread pool before a
+        single bulk_create(). Like bulk_create(), this skips save() and the
+        post_save signals, so caches those signals refresh are left to expire.
+        """
+        users = [dict(user) for user in users]
+        with ThreadPoolExecutor() as executor:
+            passwords = list(executor.map(make_password, [user.pop('password', None) for user in users]))
+        
+        objs = []
+        for user, password in zip(users, passwords):
+            obj = self.model(password=password, **user)
+            obj.email = self.normalize_email(obj.email)
+            obj.username = self.model.normalize_username(obj.username)
+            objs.append(obj)
+        
+        return self.bulk_create(objs, batch_size=batch_size)
+
+
 class User(AbstractUser):
     """
     Custom User model with additional fields for delivery app.
@@ -18,9 +47,11 @@ class User(AbstractUser):
     
     email = models.EmailField(_('email address'), unique=True)
     phone = models.CharField(max_length=20, blank=True)
-    role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='admin')
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='admin', db_index=True)
     avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)
     
+    objects = UserManager()
+    
     # Use email as username
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
@@ -0,0 +1,16 @@
+"""
+Signal handlers for the users app.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .cache import invalidate_profile
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    """
+    Drop the cached profile whenever the user row changes.
+    """
+    invalidate_profile(instance.pk)
\ No newline at end of file
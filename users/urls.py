@@ -7,7 +7,6 @@ from .views import (
     CustomTokenObtainPairView,
     UserRegistrationView,
     UserProfileView,
-    login_view,
 )
 
 urlpatterns = [
@@ -2,12 +2,12 @@
 Views for user authentication and profile management.
 """
 from rest_framework import status, generics
-from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from django.contrib.auth import authenticate
+from django.core.cache import cache
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
+from .cache import PROFILE_CACHE_TIMEOUT, profile_cache_key
 from .models import User
 from .serializers import (
     CustomTokenObtainPairSerializer,
@@ -80,9 +80,8 @@ class UserRegistrationView(generics.CreateAPIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
         
-        # Generate tokens for the new user
-        token_serializer = CustomTokenObtainPairSerializer()
-        token_data = token_serializer.get_token(user)
+        # Generate tokens for the new user; get_token is a classmethod, so no serializer instance is needed
+        token_data = CustomTokenObtainPairSerializer.get_token(user)
         
         return Response({
             'success': True,
@@ -122,10 +121,20 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     )
     def retrieve(self, request, *args, **kwargs):
         user = self.get_object()
-        serializer = self.get_serializer(user)
+        key = profile_cache_key(user.pk)
+        
+        # The avatar URL is absolute, so only reuse data built for the same base URL
+        base_url = request.build_absolute_uri('/')
+        cached = cache.get(key)
+        if cached is not None and cached['base_url'] == base_url:
+            data = cached['data']
+        else:
+            data = self.get_serializer(user).data
+            cache.set(key, {'base_url': base_url, 'data': data}, PROFILE_CACHE_TIMEOUT)
+        
         return Response({
             'success': True,
-            'data': serializer.data
+            'data': data
         })
     
     @extend_schema(
@@ -150,89 +159,3 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
                 'updatedAt': user.date_joined,
             }
         })
-
-
-@extend_schema(
-    tags=['auth'],
-    summary='User Login',
-    description='Authenticate a user with email and password to receive JWT tokens.',
-    examples=[
-        OpenApiExample(
-            'Driver Login',
-            value={
-                'email': 'driver@example.com',
-                'password': 'password123'
-            }
-        )
-    ],
-    responses={
-        200: {
-            'type': 'object',
-            'properties': {
-                'success': {'type': 'boolean'},
-                'data': {
-                    'type': 'object',
-                    'properties': {
-                        'token': {'type': 'string'},
-                        'user': {
-                            'type': 'object',
-                            'properties': {
-                                'id': {'type': 'integer'},
-                                'name': {'type': 'string'},
-                                'email': {'type': 'string'},
-                                'phone': {'type': 'string'},
-                                'role': {'type': 'string'}
-                            }
-                        }
-                    }
-                }
-            }
-        }
-    }
-)
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def login_view(request):
-    """
-    Custom login view.
-    """
-    email = request.data.get('email')
-    password = request.data.get('password')
-    
-    if not email or not password:
-        return Response({
-            'success': False,
-            'error': {
-                'code': 'VALIDATION_ERROR',
-                'message': 'Email and password are required'
-            }
-        }, status=status.HTTP_400_BAD_REQUEST)
-    
-    user = authenticate(username=email, password=password)
-    
-    if not user:
-        return Response({
-            'success': False,
-            'error': {
-                'code': 'UNAUTHORIZED',
-                'message': 'Invalid credentials'
-            }
-        }, status=status.HTTP_401_UNAUTHORIZED)
-    
-    # Generate tokens
-    token_serializer = CustomTokenObtainPairSerializer()
-    token_data = token_serializer.get_token(user)
-    
-    return Response({
-        'success': True,
-        'data': {
-            'token': str(token_data.access_token),
-            'user': {
-                'id': user.id,
-                'name': user.full_name,
-                'email': user.email,
-                'phone': user.phone,
-                'role': user.role,
-            }
-        }
-    }) 
\ No newline at end of file